@@ -1,3 +1,6 @@
+import math
+import operator
+from typing import Callable, Dict, Type
 from .schemas import CalculationType
 
 class BaseOperation:
@@ -24,13 +27,41 @@ class DivOperation(BaseOperation):
     def compute(self) -> float:
         return self.a / self.b
 
+class PowOperation(BaseOperation):
+    def compute(self) -> float:
+        return math.pow(self.a, self.b)
+
+class ModOperation(BaseOperation):
+    def compute(self) -> float:
+        return self.a % self.b
+
+OPERATIONS: Dict[CalculationType, Type[BaseOperation]] = {
+    CalculationType.add: AddOperation,
+    CalculationType.sub: SubOperation,
+    CalculationType.mul: MulOperation,
+    CalculationType.div: DivOperation,
+    CalculationType.pow: PowOperation,
+    CalculationType.mod: ModOperation,
+}
+
 def get_operation(calc_type: CalculationType, a: float, b: float) -> BaseOperation:
-    if calc_type == CalculationType.add:
-        return AddOperation(a, b)
-    if calc_type == CalculationType.sub:
-        return SubOperation(a, b)
-    if calc_type == CalculationType.mul:
-        return MulOperation(a, b)
-    if calc_type == CalculationType.div:
-        return DivOperation(a, b)
-    raise ValueError(f"Unsupported type: {calc_type}")
+    op_cls = OPERATIONS.get(calc_type)
+    if op_cls is None:
+        raise ValueError(f"Unsupported type: {calc_type}")
+    return op_cls(a, b)
+
+# Plain functions for hot paths that only need the result, not an operation object
+OPERATION_FUNCS: Dict[CalculationType, Callable[[float, float], float]] = {
+    CalculationType.add: operator.add,
+    CalculationType.sub: operator.sub,
+    CalculationType.mul: operator.mul,
+    CalculationType.div: operator.truediv,
+    CalculationType.pow: math.pow,
+    CalculationType.mod: operator.mod,
+}
+
+def compute_operation(calc_type: CalculationType, a: float, b: float) -> float:
+    fn = OPERATION_FUNCS.get(calc_type)
+    if fn is None:
+        raise ValueError(f"Unsupported type: {calc_type}")
+    return fn(a, b)
@@ -0,0 +1,104 @@
+import gzip
+import hashlib
+import os
+from typing import Dict, Tuple
+
+import brotli
+from fastapi import Request, Response
+from starlette.datastructures import Headers
+from starlette.middleware.gzip import GZipMiddleware, GZipResponder
+from starlette.types import Message, Receive, Scope, Send
+
+COMPRESSION_LEVEL = int(os.getenv("COMPRESSION_LEVEL", "6"))
+COMPRESSION_MIN_SIZE = int(os.getenv("COMPRESSION_MIN_SIZE", "1000"))
+# "/" is not a fingerprinted URL, so cache for a day and revalidate with the ETag
+STATIC_CACHE_MAX_AGE = int(os.getenv("STATIC_CACHE_MAX_AGE", "86400"))
+
+# Server preference when the client rates several encodings equally
+ENCODING_PREFERENCE = ("br", "gzip", "identity")
+
+
+def parse_accept_encoding(header: str) -> Dict[str, float]:
+    accepted: Dict[str, float] = {}
+    for part in header.split(","):
+        coding, _, params = part.strip().partition(";")
+        coding = coding.strip().lower()
+        if not coding:
+            continue
+        q = 1.0
+        params = params.strip()
+        if params.startswith("q="):
+            try:
+                q = float(params[2:])
+            except ValueError:
+                q = 0.0
+        accepted[coding] = q
+    return accepted
+
+
+def choose_encoding(header: str, available: Tuple[str, ...] = ENCODING_PREFERENCE) -> str:
+    accepted = parse_accept_encoding(header)
+    wildcard = accepted.get("*")
+    best, best_q = "identity", 0.0
+    for coding in available:
+        q = accepted.get(coding, wildcard if wildcard is not None else (1.0 if coding == "identity" else 0.0))
+        if q > best_q:
+            best, best_q = coding, q
+    return best
+
+
+def etag_matches(if_none_match: str, etag: str) -> bool:
+    # If-None-Match uses weak comparison, so W/"x" matches "x"
+    tags = [t.strip().removeprefix("W/") for t in if_none_match.split(",")]
+    return "*" in tags or etag in tags
+
+
+class PrecompressedAsset:
+    def __init__(self, body: bytes, media_type: str) -> None:
+        digest = hashlib.sha256(body).hexdigest()[:20]
+        self.media_type = media_type
+        self.variants: Dict[str, Tuple[bytes, str]] = {
+            "identity": (body, f'"{digest}"'),
+            "gzip": (gzip.compress(body, compresslevel=9, mtime=0), f'"{digest}-gz"'),
+            "br": (brotli.compress(body, quality=11), f'"{digest}-br"'),
+        }
+        self.cache_control = f"public, max-age={STATIC_CACHE_MAX_AGE}"
+
+    def response(self, request: Request) -> Response:
+        encoding = choose_encoding(request.headers.get("accept-encoding", ""))
+        body, etag = self.variants[encoding]
+        headers = {"ETag": etag, "Cache-Control": self.cache_control, "Vary": "Accept-Encoding"}
+        if encoding != "identity":
+            headers["Content-Encoding"] = encoding
+        if etag_matches(request.headers.get("if-none-match", ""), etag):
+            return Response(status_code=304, headers=headers)
+        return Response(content=body, media_type=self.media_type, headers=headers)
+
+
+class JSONGZipResponder(GZipResponder):
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        self.downstream = send
+        self.is_json = False
+        await super().__call__(scope, receive, send)
+
+    async def send_with_gzip(self, message: Message) -> None:
+        if message["type"] == "http.response.start":
+            content_type = Headers(raw=message["headers"]).get("content-type", "")
+            self.is_json = content_type.startswith("application/json")
+        if self.is_json:
+            await super().send_with_gzip(message)
+        else:
+            # Non-JSON bodies go out untouched, headers and all
+            await self.downstream(message)
+
+
+class CompressionMiddleware(GZipMiddleware):
+    # GZipMiddleware only checks for the substring "gzip"; honour q-values too
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] == "http":
+            accept = Headers(scope=scope).get("accept-encoding", "")
+            if choose_encoding(accept, ("gzip", "identity")) == "gzip":
+                responder = JSONGZipResponder(self.app, self.minimum_size, compresslevel=self.compresslevel)
+                await responder(scope, receive, send)
+                return
+        await self.app(scope, receive, send)
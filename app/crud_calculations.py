@@ -1,7 +1,8 @@
 from typing import List, Optional
 from sqlalchemy.orm import Session
 from . import models, schemas
-from .calculation_factory import get_operation
+from .calculation_factory import compute_operation
+from .expressions import get_plan
 from .schemas import CalculationType
 
 def browse_calculations(db: Session, user_id: int) -> List[models.Calculation]:
@@ -11,12 +12,24 @@ def get_calculation(db: Session, calc_id: int) -> Optional[models.Calculation]:
     return db.query(models.Calculation).filter(models.Calculation.id == calc_id).first()
 
 def create_calculation(db: Session, calc_in: schemas.CalculationCreate, user_id: int) -> models.Calculation:
-    op = get_operation(calc_in.type, calc_in.a, calc_in.b)
     calc = models.Calculation(
         a=calc_in.a,
         b=calc_in.b,
         type=calc_in.type.value,
-        result=op.compute(),
+        result=compute_operation(calc_in.type, calc_in.a, calc_in.b),
+        user_id=user_id,
+    )
+    db.add(calc)
+    db.commit()
+    db.refresh(calc)
+    return calc
+
+def create_expression_calculation(db: Session, expr_in: schemas.ExpressionCreate, user_id: int) -> models.Calculation:
+    plan = get_plan(expr_in.expression)
+    calc = models.Calculation(
+        type=CalculationType.expr.value,
+        expression=plan.expression,
+        result=plan.evaluate(expr_in.variables),
         user_id=user_id,
     )
     db.add(calc)
@@ -32,8 +45,7 @@ def update_calculation(db: Session, calc: models.Calculation, update: schemas.Ca
     if update.type is not None:
         calc.type = update.type.value
 
-    op = get_operation(CalculationType(calc.type), calc.a, calc.b)
-    calc.result = op.compute()
+    calc.result = compute_operation(CalculationType(calc.type), calc.a, calc.b)
 
     db.add(calc)
     db.commit()
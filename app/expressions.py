@@ -0,0 +1,123 @@
+import ast
+import math
+import os
+from functools import lru_cache
+from itertools import starmap
+from typing import Callable, Iterable, List, Mapping, Sequence, Tuple
+
+EXPRESSION_CACHE_SIZE = int(os.getenv("EXPRESSION_CACHE_SIZE", "1024"))
+# Limit on the normalized form, which is what gets stored and cached
+MAX_EXPRESSION_LENGTH = 255
+# Raw input may carry extra whitespace/parentheses; this only bounds parse cost
+MAX_EXPRESSION_INPUT_LENGTH = 4 * MAX_EXPRESSION_LENGTH
+MAX_BATCH_ROWS = 10_000
+
+_BIN_OPS = (ast.Add, ast.Sub, ast.Mult, ast.Div, ast.Mod, ast.Pow)
+_UNARY_OPS = (ast.UAdd, ast.USub)
+_POW = "_pow"
+
+# Compiled plans only ever see their own parameters plus these names.
+_PLAN_GLOBALS = {"__builtins__": {}, _POW: math.pow}
+
+
+class CompiledExpression:
+    def __init__(self, expression: str, variables: Tuple[str, ...], fn: Callable[..., float]) -> None:
+        self.expression = expression
+        self.variables = variables
+        self._fn = fn
+
+    def evaluate(self, values: Mapping[str, float]) -> float:
+        try:
+            row = [values[name] for name in self.variables]
+        except KeyError as exc:
+            raise ValueError(f"Missing variable: {exc.args[0]}") from None
+        return self.evaluate_row(row)
+
+    def evaluate_row(self, row: Sequence[float]) -> float:
+        result = self._fn(*row)
+        if not math.isfinite(result):
+            raise ValueError(f"Result is not finite: {self.expression}")
+        return result
+
+    def evaluate_batch(self, rows: Iterable[Sequence[float]]) -> List[float]:
+        # Rows are positional, in the order of self.variables.
+        results = list(starmap(self._fn, rows))
+        if not all(map(math.isfinite, results)):
+            raise ValueError(f"Result is not finite: {self.expression}")
+        return results
+
+
+def _validate(node: ast.AST, variables: List[str]) -> ast.AST:
+    if isinstance(node, ast.BinOp) and isinstance(node.op, _BIN_OPS):
+        left = _validate(node.left, variables)
+        right = _validate(node.right, variables)
+        if isinstance(node.op, ast.Pow):
+            # math.pow keeps ** in float space: no huge ints, no complex results
+            return ast.Call(func=ast.Name(id=_POW, ctx=ast.Load()), args=[left, right], keywords=[])
+        return ast.BinOp(left=left, op=node.op, right=right)
+    if isinstance(node, ast.UnaryOp) and isinstance(node.op, _UNARY_OPS):
+        return ast.UnaryOp(op=node.op, operand=_validate(node.operand, variables))
+    if isinstance(node, ast.Constant) and type(node.value) in (int, float):
+        return ast.Constant(value=float(node.value))
+    if isinstance(node, ast.Name):
+        if node.id.startswith("_"):
+            raise ValueError(f"Invalid variable name: {node.id}")
+        if node.id not in variables:
+            variables.append(node.id)
+        return ast.Name(id=node.id, ctx=ast.Load())
+    raise ValueError(f"Unsupported expression element: {type(node).__name__}")
+
+
+def _parse(expression: str) -> ast.Expression:
+    try:
+        return ast.parse(expression.strip(), mode="eval")
+    except SyntaxError:
+        raise ValueError(f"Invalid expression: {expression!r}") from None
+
+
+def normalize_expression(expression: str) -> str:
+    if len(expression) > MAX_EXPRESSION_INPUT_LENGTH:
+        raise ValueError(f"Expression input longer than {MAX_EXPRESSION_INPUT_LENGTH} characters")
+    tree = _parse(expression)
+    _validate(tree.body, [])
+    normalized = ast.unparse(tree)
+    if len(normalized) > MAX_EXPRESSION_LENGTH:
+        raise ValueError(f"Normalized expression longer than {MAX_EXPRESSION_LENGTH} characters: {normalized!r}")
+    return normalized
+
+
+def compile_plan(expression: str) -> CompiledExpression:
+    tree = _parse(expression)
+    variables: List[str] = []
+    body = _validate(tree.body, variables)
+    variables.sort()
+    args = ast.arguments(
+        posonlyargs=[],
+        args=[ast.arg(arg=name) for name in variables],
+        kwonlyargs=[],
+        kw_defaults=[],
+        defaults=[],
+    )
+    lambda_tree = ast.fix_missing_locations(ast.Expression(body=ast.Lambda(args=args, body=body)))
+    fn = eval(compile(lambda_tree, "<expression>", "eval"), _PLAN_GLOBALS)
+    return CompiledExpression(ast.unparse(tree), tuple(variables), fn)
+
+
+@lru_cache(maxsize=EXPRESSION_CACHE_SIZE)
+def get_plan(normalized: str) -> CompiledExpression:
+    # Only pass the output of normalize_expression, so one formula maps to one entry.
+    return compile_plan(normalized)
+
+
+@lru_cache(maxsize=EXPRESSION_CACHE_SIZE)
+def _normalize_memo(expression: str) -> str:
+    # Raw text -> normalized text only; plans live in get_plan's cache alone.
+    return normalize_expression(expression)
+
+
+def compile_expression(expression: str) -> CompiledExpression:
+    return get_plan(_normalize_memo(expression))
+
+
+def evaluate_expression(expression: str, values: Mapping[str, float]) -> float:
+    return compile_expression(expression).evaluate(values)
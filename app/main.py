@@ -1,5 +1,6 @@
-from fastapi import FastAPI
+from fastapi import FastAPI, Request
 from fastapi.responses import HTMLResponse
+from .compression import COMPRESSION_LEVEL, COMPRESSION_MIN_SIZE, CompressionMiddleware, PrecompressedAsset
 from .database import Base, engine, SessionLocal
 from .routers import users, calculations
 from . import schemas, crud_users
@@ -7,6 +8,7 @@ from . import schemas, crud_users
 Base.metadata.create_all(bind=engine)
 
 app = FastAPI(title="FastAPI Calculator with Login + BREAD")
+app.add_middleware(CompressionMiddleware, minimum_size=COMPRESSION_MIN_SIZE, compresslevel=COMPRESSION_LEVEL)
 
 def seed_demo_user():
     db = SessionLocal()
@@ -70,6 +72,8 @@ CALC_HTML = """<!DOCTYPE html>
       <option value="sub">Subtract</option>
       <option value="mul">Multiply</option>
       <option value="div">Divide</option>
+      <option value="pow">Power</option>
+      <option value="mod">Modulo</option>
     </select>
 
     <label for="calc-id-edit">Calculation ID (Read/Edit/Delete):</label>
@@ -124,7 +128,7 @@ function validateInputs() {
   if (aV === '' || bV === '') { calcError.textContent = 'Enter both numbers.'; return null; }
   const a = parseFloat(aV); const b = parseFloat(bV);
   if (!Number.isFinite(a) || !Number.isFinite(b)) { calcError.textContent = 'Invalid numbers.'; return null; }
-  if (t === 'div' && b === 0) { calcError.textContent = 'Division by zero not allowed.'; return null; }
+  if ((t === 'div' || t === 'mod') && b === 0) { calcError.textContent = 'Division by zero not allowed.'; return null; }
   return { type: t, a, b };
 }
 
@@ -153,11 +157,19 @@ async function login() {
   await refresh();
 }
 
+function escapeHtml(text) {
+  const div = document.createElement('div');
+  div.textContent = text;
+  return div.innerHTML;
+}
+
 function render(list) {
   tableBody.innerHTML = '';
   list.forEach(item => {
     const tr = document.createElement('tr');
-    tr.innerHTML = `<td>${item.id}</td><td>${item.a}</td><td>${item.b}</td><td>${item.type}</td><td>${item.result}</td>
+    const isExpr = item.type === 'expr';
+    tr.innerHTML = `<td>${item.id}</td><td>${isExpr ? '' : item.a}</td><td>${isExpr ? '' : item.b}</td>
+      <td>${isExpr ? escapeHtml(item.expression) : item.type}</td><td>${item.result}</td>
       <td><button data-id="${item.id}" class="load">Load</button></td>`;
     tableBody.appendChild(tr);
   });
@@ -193,6 +205,13 @@ async function readById() {
   const resp = await fetch(`/calculations/${id}`, { headers:{'Authorization':'Bearer ' + accessToken} });
   if (!resp.ok) { calcError.textContent = 'Not found'; return; }
   const data = await resp.json();
+  if (data.type === 'expr') {
+    // Expression rows have no a/b and cannot be edited from this form
+    document.getElementById('a').value = '';
+    document.getElementById('b').value = '';
+    resultSpan.textContent = data.expression + ' = ' + data.result;
+    return;
+  }
   document.getElementById('a').value = data.a;
   document.getElementById('b').value = data.b;
   document.getElementById('type').value = data.type;
@@ -229,6 +248,9 @@ document.getElementById('calc-delete-btn').addEventListener('click', deleteById)
 </script>
 </body></html>"""
 
+# Compressed once at startup; served per Accept-Encoding
+CALC_PAGE = PrecompressedAsset(CALC_HTML.encode("utf-8"), "text/html; charset=utf-8")
+
 @app.get("/", response_class=HTMLResponse)
-def root():
-    return HTMLResponse(CALC_HTML)
+def root(request: Request):
+    return CALC_PAGE.response(request)
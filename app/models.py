@@ -1,6 +1,7 @@
 from sqlalchemy import Column, Integer, String, Float, ForeignKey
 from sqlalchemy.orm import relationship
 from .database import Base
+from .expressions import MAX_EXPRESSION_LENGTH
 
 class User(Base):
     __tablename__ = "users"
@@ -14,9 +15,10 @@ class User(Base):
 class Calculation(Base):
     __tablename__ = "calculations"
     id = Column(Integer, primary_key=True, index=True)
-    a = Column(Float, nullable=False)
-    b = Column(Float, nullable=False)
+    a = Column(Float, nullable=True)
+    b = Column(Float, nullable=True)
     type = Column(String(20), nullable=False)
+    expression = Column(String(MAX_EXPRESSION_LENGTH), nullable=True)
     result = Column(Float, nullable=False)
     user_id = Column(Integer, ForeignKey("users.id"), nullable=False)
 
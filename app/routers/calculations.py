@@ -2,6 +2,7 @@ from typing import List
 from fastapi import APIRouter, Depends, HTTPException, status
 from sqlalchemy.orm import Session
 from .. import schemas, crud_calculations, models
+from ..expressions import get_plan
 from ..dependencies import get_db, get_current_user
 
 router = APIRouter(prefix="/calculations", tags=["calculations"])
@@ -12,7 +13,28 @@ def browse(db: Session = Depends(get_db), user: models.User = Depends(get_curren
 
 @router.post("/", response_model=schemas.CalculationRead, status_code=status.HTTP_201_CREATED)
 def add(calc_in: schemas.CalculationCreate, db: Session = Depends(get_db), user: models.User = Depends(get_current_user)):
-    return crud_calculations.create_calculation(db, calc_in, user_id=user.id)
+    try:
+        return crud_calculations.create_calculation(db, calc_in, user_id=user.id)
+    except (ArithmeticError, ValueError) as exc:
+        raise HTTPException(status_code=422, detail=str(exc))
+
+@router.post("/expression", response_model=schemas.CalculationRead, status_code=status.HTTP_201_CREATED)
+def add_expression(expr_in: schemas.ExpressionCreate, db: Session = Depends(get_db), user: models.User = Depends(get_current_user)):
+    try:
+        return crud_calculations.create_expression_calculation(db, expr_in, user_id=user.id)
+    except (ArithmeticError, ValueError) as exc:
+        raise HTTPException(status_code=422, detail=str(exc))
+
+@router.post("/expression/batch", response_model=schemas.ExpressionBatchResult)
+def evaluate_expression_batch(batch: schemas.ExpressionBatch, user: models.User = Depends(get_current_user)):
+    try:
+        plan = get_plan(batch.expression)
+        if any(len(row) != len(plan.variables) for row in batch.rows):
+            raise HTTPException(status_code=422, detail=f"Each row needs {len(plan.variables)} operands: {', '.join(plan.variables)}")
+        results = plan.evaluate_batch(batch.rows)
+    except (ArithmeticError, ValueError) as exc:
+        raise HTTPException(status_code=422, detail=str(exc))
+    return schemas.ExpressionBatchResult(expression=plan.expression, variables=list(plan.variables), results=results)
 
 @router.get("/{calc_id}", response_model=schemas.CalculationRead)
 def read(calc_id: int, db: Session = Depends(get_db), user: models.User = Depends(get_current_user)):
@@ -28,13 +50,19 @@ def edit(calc_id: int, update: schemas.CalculationUpdate, db: Session = Depends(
     if not calc or calc.user_id != user.id:
         raise HTTPException(status_code=404, detail="Calculation not found")
 
-    # Division by zero guard for updates
     new_type = update.type.value if update.type else calc.type
+    if calc.type == "expr" or new_type == "expr":
+        raise HTTPException(status_code=422, detail="Expression calculations cannot be edited")
+
+    # Division by zero guard for updates
     new_b = update.b if update.b is not None else calc.b
-    if new_type == "div" and new_b == 0:
+    if new_type in ("div", "mod") and new_b == 0:
         raise HTTPException(status_code=422, detail="b cannot be zero for division")
 
-    return crud_calculations.update_calculation(db, calc, update)
+    try:
+        return crud_calculations.update_calculation(db, calc, update)
+    except (ArithmeticError, ValueError) as exc:
+        raise HTTPException(status_code=422, detail=str(exc))
 
 @router.delete("/{calc_id}", status_code=status.HTTP_204_NO_CONTENT)
 def delete(calc_id: int, db: Session = Depends(get_db), user: models.User = Depends(get_current_user)):
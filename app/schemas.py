@@ -1,6 +1,7 @@
 from enum import Enum
-from typing import Optional
-from pydantic import BaseModel, EmailStr, field_validator
+from typing import Dict, List, Optional
+from pydantic import BaseModel, EmailStr, Field, field_validator
+from .expressions import MAX_BATCH_ROWS, normalize_expression
 
 class UserBase(BaseModel):
     username: str
@@ -23,18 +24,31 @@ class CalculationType(str, Enum):
     sub = "sub"
     mul = "mul"
     div = "div"
+    pow = "pow"
+    mod = "mod"
+    expr = "expr"
+
+# Types whose second operand must be non-zero
+ZERO_DIVISOR_TYPES = (CalculationType.div, CalculationType.mod)
 
 class CalculationCreate(BaseModel):
     type: CalculationType
     a: float
     b: float
 
+    @field_validator("type")
+    @classmethod
+    def no_expression_type(cls, v):
+        if v == CalculationType.expr:
+            raise ValueError("use /calculations/expression for expressions")
+        return v
+
     @field_validator("b")
     @classmethod
     def no_zero_divisor(cls, v, info):
         # Pydantic v2: info.data contains validated fields so far
         calc_type = info.data.get("type")
-        if calc_type == CalculationType.div and v == 0:
+        if calc_type in ZERO_DIVISOR_TYPES and v == 0:
             raise ValueError("b cannot be zero for division")
         return v
 
@@ -43,11 +57,33 @@ class CalculationUpdate(BaseModel):
     a: Optional[float] = None
     b: Optional[float] = None
 
+class ExpressionBase(BaseModel):
+    expression: str
+
+    @field_validator("expression")
+    @classmethod
+    def valid_expression(cls, v):
+        # Normalized once here; routes look plans up by this string
+        return normalize_expression(v)
+
+class ExpressionCreate(ExpressionBase):
+    variables: Dict[str, float] = {}
+
+class ExpressionBatch(ExpressionBase):
+    # Each row lists operands in the sorted order of the expression's variables
+    rows: List[List[float]] = Field(max_length=MAX_BATCH_ROWS)
+
+class ExpressionBatchResult(BaseModel):
+    expression: str
+    variables: List[str]
+    results: List[float]
+
 class CalculationRead(BaseModel):
     id: int
-    a: float
-    b: float
+    a: Optional[float] = None
+    b: Optional[float] = None
     type: CalculationType
+    expression: Optional[str] = None
     result: float
     user_id: int
     class Config:
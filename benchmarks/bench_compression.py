@@ -0,0 +1,70 @@
+"""Bytes on the wire and server-side CPU per request for the UI and a 10k-row browse.
+
+Run from the project root:  python -m benchmarks.bench_compression
+"""
+import os
+import tempfile
+import time
+
+ROWS = 10_000
+REPEAT = 20
+ENCODINGS = ["identity", "gzip", "br"]
+
+
+class ServerTimer:
+    """ASGI wrapper that adds up process CPU spent inside the app only.
+
+    The TestClient thread blocks while the app runs and decodes the body
+    afterwards, so client-side decompression is not counted.
+    """
+
+    def __init__(self, app):
+        self.app = app
+        self.cpu = 0.0
+
+    async def __call__(self, scope, receive, send):
+        start = time.process_time()
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            self.cpu += time.process_time() - start
+
+
+def measure(client, timer, path, headers):
+    client.get(path, headers=headers)  # warm up
+    timer.cpu = 0.0
+    for _ in range(REPEAT):
+        r = client.get(path, headers=headers)
+    # httpx decodes the body, so the header carries the on-the-wire size
+    return int(r.headers["content-length"]), timer.cpu / REPEAT
+
+
+def main() -> None:
+    tmp = tempfile.mkdtemp()
+    os.environ["DATABASE_URL"] = f"sqlite:///{os.path.join(tmp, 'bench.db')}"
+
+    from fastapi.testclient import TestClient
+    from app import main as app_main, models, security
+    from app.database import SessionLocal
+
+    db = SessionLocal()
+    demo = db.query(models.User).filter(models.User.username == "demo").first()
+    db.bulk_save_objects([
+        models.Calculation(a=float(i), b=2.0, type="mul", result=i * 2.0, user_id=demo.id) for i in range(ROWS)
+    ])
+    db.commit()
+    db.close()
+
+    timer = ServerTimer(app_main.app)
+    client = TestClient(timer)
+    token = security.create_access_token({"sub": "demo"})
+
+    print(f"{'request':28s} {'encoding':>9s} {'wire bytes':>11s} {'server cpu ms/req':>18s}")
+    for label, path, auth in [("UI /", "/", {}), (f"browse {ROWS} rows", "/calculations/", {"Authorization": f"Bearer {token}"})]:
+        for encoding in ENCODINGS:
+            wire, cpu = measure(client, timer, path, {**auth, "Accept-Encoding": encoding})
+            print(f"{label:28s} {encoding:>9s} {wire:11d} {cpu * 1000:18.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,64 @@
+"""Cached vs uncached expression evaluation.
+
+Run from the project root:  python -m benchmarks.bench_expressions
+"""
+import random
+import timeit
+
+from app.calculation_factory import compute_operation, get_operation
+from app.expressions import compile_expression, compile_plan, get_plan, normalize_expression
+from app.schemas import CalculationType
+
+EXPRESSION = "(a + b) * c / d"
+N = 100_000
+
+
+def main() -> None:
+    rng = random.Random(0)
+    rows = [(rng.random(), rng.random(), rng.random(), rng.random() + 1.0) for _ in range(N)]
+    mappings = [dict(zip("abcd", row)) for row in rows]
+
+    def factory_chain():
+        for a, b, c, d in rows:
+            s = get_operation(CalculationType.add, a, b).compute()
+            m = get_operation(CalculationType.mul, s, c).compute()
+            get_operation(CalculationType.div, m, d).compute()
+
+    def factory_funcs():
+        for a, b, c, d in rows:
+            s = compute_operation(CalculationType.add, a, b)
+            m = compute_operation(CalculationType.mul, s, c)
+            compute_operation(CalculationType.div, m, d)
+
+    def uncached():
+        for values in mappings[: N // 100]:
+            compile_plan(EXPRESSION).evaluate(values)
+
+    def cached():
+        for values in mappings:
+            compile_expression(EXPRESSION).evaluate(values)
+
+    def cached_normalized():
+        normalized = normalize_expression(EXPRESSION)
+        for values in mappings:
+            get_plan(normalized).evaluate(values)
+
+    def batch():
+        compile_expression(EXPRESSION).evaluate_batch(rows)
+
+    cases = [
+        ("get_operation objects, 3 ops/row", factory_chain, N),
+        ("compute_operation, 3 ops/row", factory_funcs, N),
+        ("uncached parse+compile/row", uncached, N // 100),
+        ("compile_expression(raw)/row", cached, N),
+        ("cached lookup by normalized/row", cached_normalized, N),
+        ("cached plan, batch", batch, N),
+    ]
+    print(f"{EXPRESSION!r}")
+    for label, fn, rows_run in cases:
+        best = min(timeit.repeat(fn, number=1, repeat=5))
+        print(f"{label:32s} {best * 1e9 / rows_run:10.0f} ns/row")
+
+
+if __name__ == "__main__":
+    main()
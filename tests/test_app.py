@@ -22,6 +22,98 @@ def test_root_loads():
     assert r.status_code == 200
     assert "FastAPI Calculator" in r.text
 
+def test_root_precompressed_variants_and_etag():
+    import brotli
+    import gzip
+    client = make_client()
+
+    plain = client.get("/", headers={"Accept-Encoding": "identity"})
+    assert "content-encoding" not in plain.headers
+    assert plain.headers["cache-control"].startswith("public, max-age=")
+    assert plain.headers["vary"] == "Accept-Encoding"
+
+    gz = client.get("/", headers={"Accept-Encoding": "gzip"})
+    assert gz.headers["content-encoding"] == "gzip"
+    assert gz.text == plain.text
+    assert gz.headers["etag"] != plain.headers["etag"]
+
+    br = client.get("/", headers={"Accept-Encoding": "gzip;q=0.5, br"})
+    assert br.headers["content-encoding"] == "br"
+    assert br.text == plain.text
+    assert int(br.headers["content-length"]) < len(gzip.compress(plain.content)) < len(plain.content)
+    assert len(brotli.compress(plain.content)) == int(br.headers["content-length"])
+
+    # q=0 refuses an encoding; * covers the rest
+    r = client.get("/", headers={"Accept-Encoding": "br;q=0, *"})
+    assert r.headers["content-encoding"] == "gzip"
+    r = client.get("/", headers={"Accept-Encoding": "gzip;q=bad"})
+    assert "content-encoding" not in r.headers
+
+    # the JSON middleware leaves the precompressed page alone
+    r = client.get("/", headers={"Accept-Encoding": "br, gzip"})
+    assert r.headers["content-encoding"] == "br"
+    assert r.headers["etag"] == br.headers["etag"]
+    assert r.headers["vary"] == "Accept-Encoding"
+
+    etag = br.headers["etag"]
+    r = client.get("/", headers={"Accept-Encoding": "br", "If-None-Match": f'"other", W/{etag}'})
+    assert r.status_code == 304
+    assert r.content == b""
+    assert r.headers["etag"] == etag
+    r = client.get("/", headers={"Accept-Encoding": "gzip", "If-None-Match": etag})
+    assert r.status_code == 200
+
+def test_large_json_responses_are_gzipped():
+    client = make_client()
+    token = login(client, "demo", "Test123!")
+    headers = {"Authorization": f"Bearer {token}", "Accept-Encoding": "gzip"}
+
+    r = client.get("/calculations/", headers=headers)
+    assert "content-encoding" not in r.headers
+    for i in range(30):
+        client.post("/calculations/", json={"type":"add","a":i,"b":1}, headers=headers)
+    r = client.get("/calculations/", headers=headers)
+    assert r.headers["content-encoding"] == "gzip"
+    assert len(r.json()) >= 30
+    r = client.get("/calculations/", headers={**headers, "Accept-Encoding": "gzip;q=0"})
+    assert "content-encoding" not in r.headers
+
+def test_compression_middleware_only_compresses_json():
+    from fastapi import FastAPI
+    from fastapi.responses import HTMLResponse, PlainTextResponse, StreamingResponse
+    from app.compression import CompressionMiddleware
+
+    mini = FastAPI()
+    mini.add_middleware(CompressionMiddleware, minimum_size=10)
+
+    @mini.get("/json")
+    def json_body():
+        return {"data": "x" * 100}
+
+    @mini.get("/html", response_class=HTMLResponse)
+    def html_body():
+        return "<p>" + "x" * 100 + "</p>"
+
+    @mini.get("/text", response_class=PlainTextResponse)
+    def text_body():
+        return "x" * 100
+
+    @mini.get("/stream")
+    def stream_body():
+        return StreamingResponse(iter([b"<p>", b"x" * 100, b"</p>"]), media_type="text/html")
+
+    client = TestClient(mini)
+    headers = {"Accept-Encoding": "gzip"}
+    r = client.get("/json", headers=headers)
+    assert r.headers["content-encoding"] == "gzip"
+    assert r.headers["vary"] == "Accept-Encoding"
+    assert r.json() == {"data": "x" * 100}
+    for path in ["/html", "/text", "/stream"]:
+        r = client.get(path, headers=headers)
+        assert "content-encoding" not in r.headers
+        assert "vary" not in r.headers
+        assert r.text.count("x") == 100
+
 def test_demo_login_and_factory_paths():
     client = make_client()
     token = login(client, "demo", "Test123!")
@@ -117,3 +209,145 @@ def test_divide_by_zero_validation():
     cid = r.json()["id"]
     r = client.put(f"/calculations/{cid}", json={"type":"div","b":0}, headers=headers)
     assert r.status_code == 422
+
+def test_pow_and_mod_paths():
+    client = make_client()
+    token = login(client, "demo", "Test123!")
+    headers = {"Authorization": f"Bearer {token}"}
+
+    r = client.post("/calculations/", json={"type":"pow","a":2,"b":10}, headers=headers)
+    assert r.status_code == 201
+    assert r.json()["result"] == 1024
+    r = client.post("/calculations/", json={"type":"mod","a":10,"b":4}, headers=headers)
+    assert r.status_code == 201
+    assert r.json()["result"] == 2
+
+    r = client.post("/calculations/", json={"type":"mod","a":10,"b":0}, headers=headers)
+    assert r.status_code == 422
+
+    # math.pow domain errors and overflow surface as 422, not 500
+    for a, b in [(-8, 0.5), (10, 1000), (0, -1)]:
+        r = client.post("/calculations/", json={"type":"pow","a":a,"b":b}, headers=headers)
+        assert r.status_code == 422
+    r = client.post("/calculations/", json={"type":"add","a":1,"b":1}, headers=headers)
+    cid = r.json()["id"]
+    r = client.put(f"/calculations/{cid}", json={"type":"pow","a":-1,"b":0.5}, headers=headers)
+    assert r.status_code == 422
+    r = client.get(f"/calculations/{cid}", headers=headers)
+    assert r.json()["type"] == "add"
+    r = client.post("/calculations/", json={"type":"expr","a":1,"b":1}, headers=headers)
+    assert r.status_code == 422
+
+def test_factory_objects_and_functions_agree():
+    from app.calculation_factory import OPERATIONS, compute_operation, get_operation
+    from app.schemas import CalculationType
+
+    for calc_type in OPERATIONS:
+        assert get_operation(calc_type, 7, 2).compute() == compute_operation(calc_type, 7, 2)
+    for fn in (get_operation, compute_operation):
+        try:
+            fn(CalculationType.expr, 1, 1)
+        except ValueError:
+            pass
+        else:
+            raise AssertionError("expr accepted by factory")
+
+def test_expression_engine_compiles_and_caches():
+    from app import expressions
+
+    plan = expressions.compile_expression("(a+b)*c/d")
+    assert plan.expression == "(a + b) * c / d"
+    assert plan.variables == ("a", "b", "c", "d")
+    # same normalized shape -> same cached plan
+    assert expressions.compile_expression(" ( a + b ) * c / d ") is plan
+    assert expressions.get_plan(expressions.normalize_expression("(a + (b)) * c / d")) is plan
+    # raw-text callers skip re-parsing on repeat calls
+    parses = expressions._normalize_memo.cache_info().misses
+    expressions.compile_expression("(a+b)*c/d")
+    assert expressions._normalize_memo.cache_info().misses == parses
+    assert plan.evaluate({"a": 1, "b": 2, "c": 4, "d": 3}) == 4
+    assert plan.evaluate_batch([(1, 2, 4, 3), (0, 1, 6, 2)]) == [4, 3]
+    assert expressions.evaluate_expression("-x ** 2 % 5", {"x": 3}) == 1
+
+    for bad in ["__import__('os')", "a.b", "f(a)", "a if b else c", "_pow(a, b)", "_x + 1", "a +", "'s'", "a < b"]:
+        try:
+            expressions.compile_expression(bad)
+        except ValueError:
+            pass
+        else:
+            raise AssertionError(bad)
+    try:
+        plan.evaluate({"a": 1})
+    except ValueError as exc:
+        assert "Missing variable" in str(exc)
+    else:
+        raise AssertionError("missing variable accepted")
+
+def test_expression_endpoints():
+    client = make_client()
+    token = login(client, "demo", "Test123!")
+    headers = {"Authorization": f"Bearer {token}"}
+
+    r = client.post("/calculations/expression", json={"expression":"(a+b)*c/d","variables":{"a":1,"b":2,"c":4,"d":3}}, headers=headers)
+    assert r.status_code == 201
+    body = r.json()
+    assert body["type"] == "expr"
+    assert body["expression"] == "(a + b) * c / d"
+    assert body["result"] == 4
+    cid = body["id"]
+
+    r = client.get(f"/calculations/{cid}", headers=headers)
+    assert r.json()["expression"] == "(a + b) * c / d"
+    r = client.put(f"/calculations/{cid}", json={"a":5}, headers=headers)
+    assert r.status_code == 422
+
+    r = client.post("/calculations/expression", json={"expression":"a / b","variables":{"a":1,"b":0}}, headers=headers)
+    assert r.status_code == 422
+    r = client.post("/calculations/expression", json={"expression":"a * b","variables":{"a":1}}, headers=headers)
+    assert r.status_code == 422
+    r = client.post("/calculations/expression", json={"expression":"open('x')"}, headers=headers)
+    assert r.status_code == 422
+    # overflow to inf is rejected before anything is stored
+    before = len(client.get("/calculations/", headers=headers).json())
+    r = client.post("/calculations/expression", json={"expression":"1e308*10"}, headers=headers)
+    assert r.status_code == 422
+    r = client.post("/calculations/expression", json={"expression":"a*b","variables":{"a":1e308,"b":10}}, headers=headers)
+    assert r.status_code == 422
+    assert len(client.get("/calculations/", headers=headers).json()) == before
+
+    r = client.post("/calculations/expression/batch", json={"expression":"x ** 2 + y","rows":[[1,1],[2,3],[3,0]]}, headers=headers)
+    assert r.status_code == 200
+    assert r.json() == {"expression":"x ** 2 + y","variables":["x","y"],"results":[2,7,9]}
+    r = client.post("/calculations/expression/batch", json={"expression":"x % y","rows":[[1]]}, headers=headers)
+    assert r.status_code == 422
+    r = client.post("/calculations/expression/batch", json={"expression":"x % y","rows":[[1,0]]}, headers=headers)
+    assert r.status_code == 422
+    r = client.post("/calculations/expression/batch", json={"expression":"x * x","rows":[[2],[1e200]]}, headers=headers)
+    assert r.status_code == 422
+
+    # the length limit applies once, to the normalized form
+    from app.expressions import MAX_EXPRESSION_LENGTH
+    fits = "+".join(["a"] * 64)        # normalizes to 253 characters
+    too_long = "+".join(["a"] * 127)   # 253 raw, 505 normalized
+    r = client.post("/calculations/expression", json={"expression":fits,"variables":{"a":1}}, headers=headers)
+    assert r.status_code == 201
+    assert len(r.json()["expression"]) <= MAX_EXPRESSION_LENGTH
+    assert r.json()["result"] == 64
+    r = client.post("/calculations/expression/batch", json={"expression":fits,"rows":[[1],[2]]}, headers=headers)
+    assert r.status_code == 200
+    assert r.json()["results"] == [64, 128]
+    for path, body in [
+        ("/calculations/expression", {"expression":too_long,"variables":{"a":1}}),
+        ("/calculations/expression/batch", {"expression":too_long,"rows":[[1]]}),
+    ]:
+        r = client.post(path, json=body, headers=headers)
+        assert r.status_code == 422
+        assert "Normalized expression longer" in r.text
+    r = client.post("/calculations/expression", json={"expression":"a" + " " * 2000}, headers=headers)
+    assert r.status_code == 422
+
+    from app.expressions import MAX_BATCH_ROWS
+    r = client.post("/calculations/expression/batch", json={"expression":"2 + 3","rows":[[]] * MAX_BATCH_ROWS}, headers=headers)
+    assert r.status_code == 200
+    r = client.post("/calculations/expression/batch", json={"expression":"2 + 3","rows":[[]] * (MAX_BATCH_ROWS + 1)}, headers=headers)
+    assert r.status_code == 422